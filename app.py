@@ -10,17 +10,11 @@ from plots import (
 )
 from model import train_model, predict_life_expectancy, plot_feature_importance
 from maps import create_map_view
+from data import load_data, country_list, yearly_metrics, indexed, select_countries, to_csv_bytes
 
 # Set page to full width
 st.set_page_config(layout="wide")
 
-# Load the data
-@st.cache_data
-def load_data():
-    url = "https://raw.githubusercontent.com/JohannaViktor/streamlit_practical/refs/heads/main/global_development_data.csv"
-    df = pd.read_csv(url)
-    return df
-
 # Load the data
 df = load_data()
 
@@ -50,8 +44,8 @@ with tab1:
         value=int(df['year'].max())
     )
     
-    # Filter data for selected year (global, no country filter!)
-    year_data = df[df['year'] == selected_year]
+    # Look up metrics for selected year (global, no country filter!)
+    metrics = yearly_metrics(df).loc[selected_year]
     
     # Create 4 columns for metrics
     col1, col2, col3, col4 = st.columns(4)
@@ -59,28 +53,28 @@ with tab1:
     with col1:
         st.metric(
             label="Average Life Expectancy",
-            value=f"{year_data['Life Expectancy (IHME)'].mean():.1f} years",
+            value=f"{metrics.life:.1f} years",
             help="Mean life expectancy across all countries"
         )
     
     with col2:
         st.metric(
             label="Median GDP per Capita",
-            value=f"${year_data['GDP per capita'].median():,.0f}",
+            value=f"${metrics.gdp:,.0f}",
             help="Median GDP per capita across all countries"
         )
     
     with col3:
         st.metric(
             label="Average Poverty Rate",
-            value=f"{year_data['headcount_ratio_upper_mid_income_povline'].mean():.1f}%",
+            value=f"{metrics.pov:.1f}%",
             help="Mean poverty rate (upper-middle income poverty line) across all countries"
         )
     
     with col4:
         st.metric(
             label="Number of Countries",
-            value=f"{len(year_data['country'].unique())}",
+            value=f"{int(metrics.n)}",
             help="Total number of countries in the dataset for the selected year"
         )
     
@@ -181,7 +175,7 @@ with tab2:
     st.header("Country Deep Dive")
     
     # Country selection
-    countries = sorted(df['country'].unique())
+    countries = country_list(df)
     default_countries = ['United States', 'Russia', 'China', 'Germany', 'Thailand']
     selected_countries = st.multiselect(
         "Select Countries to Compare",
@@ -200,14 +194,17 @@ with tab2:
         st.subheader("Summary Statistics")
         
         # Filter data for selected countries
-        country_data = df[df['country'].isin(selected_countries)]
+        # (same sorted selection as the trend plot, so both share one cached slice)
+        country_data = select_countries(df, sorted(selected_countries))
         
         # Calculate statistics
-        stats = country_data.groupby('country').agg({
-            'Life Expectancy (IHME)': ['mean', 'min', 'max'],
-            'GDP per capita': ['mean', 'min', 'max'],
-            'headcount_ratio_upper_mid_income_povline': ['mean', 'min', 'max']
-        }).round(2)
+        # (one grouping, each reduction runs over all three float64 columns at once)
+        stat_columns = ['Life Expectancy (IHME)', 'GDP per capita', 'headcount_ratio_upper_mid_income_povline']
+        grouped = country_data.groupby('country', sort=False, observed=True)[stat_columns]
+        stats = pd.concat(
+            {'mean': grouped.mean(), 'min': grouped.min(), 'max': grouped.max()},
+            axis=1
+        ).swaplevel(axis=1)[stat_columns].round(2)
         
         # Display statistics
         st.dataframe(stats)
@@ -222,7 +219,7 @@ with tab3:
     
     with col1:
         # Country selection
-        countries = sorted(df['country'].unique())
+        countries = country_list(df)
         default_countries = ['United States', 'Russia', 'China', 'Germany', 'Thailand']
         selected_countries = st.multiselect(
             "Select Countries",
@@ -242,17 +239,18 @@ with tab3:
         )
     
     # Filter the dataframe
-    filtered_df = df[
-        (df['country'].isin(selected_countries)) &
-        (df['year'] >= year_range[0]) &
-        (df['year'] <= year_range[1])
-    ]
+    if selected_countries:
+        filtered_df = indexed(df).loc[
+            (selected_countries, slice(year_range[0], year_range[1])), :
+        ].reset_index()
+    else:
+        filtered_df = indexed(df).iloc[0:0].reset_index()
     
     # Display the filtered dataframe
     st.dataframe(filtered_df)
     
     # Add download button
-    csv = filtered_df.to_csv(index=False)
+    csv = to_csv_bytes(filtered_df)
     st.download_button(
         label="Download Filtered Data as CSV",
         data=csv,
@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+DATA_URL = "https://raw.githubusercontent.com/JohannaViktor/streamlit_practical/refs/heads/main/global_development_data.csv"
+
+@st.cache_resource(show_spinner='Loading data…')
+def load_data() -> pd.DataFrame:
+    """
+    Load the global development dataset.
+    Only the columns used by the app are read, with country as category
+    and year as int16, and rows are sorted by (country, year). Measures
+    stay float64 so the Data Explorer shows and exports the source values.
+    The same dataframe object is returned on every call and must not be
+    mutated; cached helpers taking it are therefore keyed by its id.
+    
+    Returns:
+        pd.DataFrame: The development dataframe
+    """
+    df = pd.read_csv(
+        DATA_URL,
+        engine='pyarrow',
+        usecols=[
+            'country',
+            'year',
+            'GDP per capita',
+            'Life Expectancy (IHME)',
+            'headcount_ratio_upper_mid_income_povline',
+            'Population'
+        ],
+        dtype={
+            'country': 'category',
+            'year': 'int16',
+            'GDP per capita': 'float64',
+            'Life Expectancy (IHME)': 'float64',
+            'headcount_ratio_upper_mid_income_povline': 'float64',
+            'Population': 'float64'
+        }
+    )
+    # Sort once so each country's rows are contiguous and in year order
+    df = df.sort_values(['country', 'year'], kind='stable', ignore_index=True)
+    return df
+
+@st.cache_data(hash_funcs={pd.DataFrame: id})
+def country_list(df: pd.DataFrame) -> list[str]:
+    """
+    Returns the sorted list of countries in the dataframe.
+    """
+    return sorted(df['country'].unique())
+
+@st.cache_resource(hash_funcs={pd.DataFrame: id})
+def year_index(df: pd.DataFrame) -> dict[int, pd.DataFrame]:
+    """
+    Split the dataframe into one slice per year, built once and reused.
+    
+    Args:
+        df (pd.DataFrame): The input dataframe
+        
+    Returns:
+        dict[int, pd.DataFrame]: Mapping from year to the rows of that year
+    """
+    return {int(y): g.reset_index(drop=True) for y, g in df.groupby('year', sort=False)}
+
+@st.cache_data(hash_funcs={pd.DataFrame: id})
+def yearly_metrics(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compute the headline metrics for every year.
+    
+    Args:
+        df (pd.DataFrame): The input dataframe
+        
+    Returns:
+        pd.DataFrame: One row per year with life, gdp, pov and n columns
+    """
+    return df.groupby('year').agg(
+        life=('Life Expectancy (IHME)', 'mean'),
+        gdp=('GDP per capita', 'median'),
+        pov=('headcount_ratio_upper_mid_income_povline', 'mean'),
+        n=('country', 'nunique')
+    )
+
+@st.cache_resource(hash_funcs={pd.DataFrame: id})
+def indexed(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns the dataframe indexed and sorted by (country, year).
+    """
+    return df.set_index(['country', 'year']).sort_index()
+
+@st.cache_resource(hash_funcs={pd.DataFrame: id})
+def country_index(df: pd.DataFrame) -> dict[str, np.ndarray]:
+    """
+    Map every country to the positions of its rows, built once and reused.
+    
+    Args:
+        df (pd.DataFrame): The input dataframe
+        
+    Returns:
+        dict[str, np.ndarray]: Mapping from country to row positions
+    """
+    return df.groupby('country', sort=False, observed=True).indices
+
+def select_countries(df: pd.DataFrame, countries: list[str]) -> pd.DataFrame:
+    """
+    Select the rows of the given countries, in the order the countries are given.
+    Slices are cached per selection and shared between callers, so the
+    returned dataframe must not be mutated.
+    
+    Args:
+        df (pd.DataFrame): The input dataframe
+        countries (list[str]): Countries to select
+        
+    Returns:
+        pd.DataFrame: Rows of the selected countries
+    """
+    return _select_countries(df, tuple(countries))
+
+@st.cache_resource(max_entries=64, hash_funcs={pd.DataFrame: id})
+def _select_countries(df: pd.DataFrame, countries: tuple[str, ...]) -> pd.DataFrame:
+    index = country_index(df)
+    rows = [index[country] for country in countries if country in index]
+    if not rows:
+        return df.iloc[0:0]
+    return df.take(np.concatenate(rows))
+
+@st.cache_data(max_entries=64)
+def to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """
+    Returns the dataframe as UTF-8 encoded CSV.
+    Keyed by the frame's contents; only the 64 most recent selections are kept.
+    """
+    return df.to_csv(index=False).encode('utf-8')
@@ -1,6 +1,8 @@
 import pandas as pd
 import pydeck as pdk
+import streamlit as st
 from typing import Dict, List
+from data import year_index
 
 def get_country_coordinates() -> pd.DataFrame:
     """
@@ -13,29 +15,50 @@ def get_country_coordinates() -> pd.DataFrame:
         'lon': [-95.7129, 104.1954, 10.4515, 105.3188, 100.9925]
     })
 
-def create_map_layers(df: pd.DataFrame, selected_year: int) -> Dict[str, pdk.Layer]:
+# Coordinates never change, so build the indexed lookup table once at import time
+_COORDS_DF = get_country_coordinates().set_index('country')
+
+@st.cache_data(hash_funcs={pd.DataFrame: id})
+def get_map_data(df: pd.DataFrame, selected_year: int) -> pd.DataFrame:
     """
-    Create map layers for different metrics.
+    Join the data for a selected year with country coordinates and add
+    formatted tooltip columns. Cached per year.
     
     Args:
         df (pd.DataFrame): The input dataframe
         selected_year (int): The year to display
         
     Returns:
-        Dict[str, pdk.Layer]: Dictionary of layers
+        pd.DataFrame: Map data with coordinates and tooltip strings
     """
-    # Filter data for selected year
-    year_data = df[df['year'] == selected_year]
+    # Look up data for selected year
+    year_data = year_index(df)[selected_year]
     
-    # Merge with coordinates
-    coordinates = get_country_coordinates()
-    map_data = pd.merge(year_data, coordinates, on='country', how='inner')
+    # Join with coordinates
+    map_data = year_data.join(_COORDS_DF, on='country', how='inner')
     
     # Add formatted columns for tooltips
     map_data['life_exp_str'] = map_data['Life Expectancy (IHME)'].round(1).astype(str) + ' years'
-    map_data['gdp_str'] = map_data['GDP per capita'].round(0).map(lambda x: f"${int(x):,}")
+    map_data['gdp_str'] = '$' + map_data['GDP per capita'].round(0).astype('int64').map('{:,}'.format)
     map_data['poverty_str'] = map_data['headcount_ratio_upper_mid_income_povline'].round(1).astype(str) + '%'
     
+    return map_data
+
+@st.cache_resource(hash_funcs={pd.DataFrame: id})
+def create_map_layers(df: pd.DataFrame, selected_year: int) -> Dict[str, pdk.Layer]:
+    """
+    Create map layers for different metrics.
+    Layers are cached per year; they hold their data, so rebuilding them is not free.
+    
+    Args:
+        df (pd.DataFrame): The input dataframe
+        selected_year (int): The year to display
+        
+    Returns:
+        Dict[str, pdk.Layer]: Dictionary of layers
+    """
+    map_data = get_map_data(df, selected_year)
+    
     # Create layers
     layers = {
         "Life Expectancy": pdk.Layer(
@@ -89,9 +112,11 @@ def create_map_layers(df: pd.DataFrame, selected_year: int) -> Dict[str, pdk.Lay
     
     return layers
 
+@st.cache_resource(hash_funcs={pd.DataFrame: id})
 def create_map_view(df: pd.DataFrame, selected_year: int, selected_layers: List[str]) -> pdk.Deck:
     """
     Create the map view with selected layers.
+    The deck is cached per year and layer selection.
     
     Args:
         df (pd.DataFrame): The input dataframe
@@ -5,11 +5,57 @@ import plotly.express as px
 from plotly.graph_objects import Figure
 import joblib
 import os
+import streamlit as st
 
+# Process-wide model and feature ranges, filled on the first train_model call
+_MODEL_CACHE = {}
+
+def _round_down_float32(values: np.ndarray) -> np.ndarray:
+    """
+    Cast to float32, rounding towards -inf, so that for any float32 x
+    `x <= result` holds exactly when `x <= values` does.
+    """
+    result = values.astype(np.float32)
+    too_high = result > values
+    result[too_high] = np.nextafter(result[too_high], np.float32(-np.inf))
+    return result
+
+def flatten_forest(model: RandomForestRegressor) -> dict[str, np.ndarray]:
+    """
+    Stack the node arrays of all trees into padded (n_trees, max_nodes) arrays.
+    
+    Args:
+        model: Trained Random Forest model
+        
+    Returns:
+        dict: Node feature, threshold, child and leaf value arrays
+    """
+    trees = [estimator.tree_ for estimator in model.estimators_]
+    shape = (len(trees), max(tree.node_count for tree in trees))
+    
+    forest = {
+        'feature': np.zeros(shape, dtype=np.int32),
+        'threshold': np.zeros(shape, dtype=np.float32),
+        'left': np.full(shape, -1, dtype=np.int32),
+        'right': np.full(shape, -1, dtype=np.int32),
+        'value': np.zeros(shape, dtype=np.float32)
+    }
+    for i, tree in enumerate(trees):
+        n = tree.node_count
+        forest['feature'][i, :n] = tree.feature
+        forest['threshold'][i, :n] = _round_down_float32(tree.threshold)
+        forest['left'][i, :n] = tree.children_left
+        forest['right'][i, :n] = tree.children_right
+        forest['value'][i, :n] = tree.value[:, 0, 0]
+    
+    return forest
+
+@st.cache_resource(show_spinner=False, hash_funcs={pd.DataFrame: id})
 def train_model(df: pd.DataFrame) -> tuple[RandomForestRegressor, dict]:
     """
     Train a Random Forest model to predict life expectancy.
     If a saved model exists, it will be loaded instead of training a new one.
+    The result is cached in memory, so disk is only touched once per process.
     
     Args:
         df (pd.DataFrame): The input dataframe
@@ -17,6 +63,10 @@ def train_model(df: pd.DataFrame) -> tuple[RandomForestRegressor, dict]:
     Returns:
         tuple: (trained model, feature ranges dictionary)
     """
+    # Reuse the model already loaded in this process
+    if 'model' in _MODEL_CACHE:
+        return _MODEL_CACHE['model'], _MODEL_CACHE['ranges']
+    
     model_path = 'model.joblib'
     ranges_path = 'feature_ranges.joblib'
     
@@ -24,6 +74,8 @@ def train_model(df: pd.DataFrame) -> tuple[RandomForestRegressor, dict]:
     if os.path.exists(model_path) and os.path.exists(ranges_path):
         model = joblib.load(model_path)
         feature_ranges = joblib.load(ranges_path)
+        model.flat_forest_ = flatten_forest(model)
+        _MODEL_CACHE.update(model=model, ranges=feature_ranges)
         return model, feature_ranges
     
     # Prepare features and target
@@ -32,21 +84,25 @@ def train_model(df: pd.DataFrame) -> tuple[RandomForestRegressor, dict]:
     y = df['Life Expectancy (IHME)']
     
     # Train model
-    model = RandomForestRegressor(n_estimators=100, random_state=42)
+    model = RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=-1)
     model.fit(X, y)
     
-    # Get feature ranges for input validation
+    # Get feature ranges for input validation (one min and one max pass over the feature block)
+    values = X.to_numpy()
+    lows, highs = np.nanmin(values, axis=0), np.nanmax(values, axis=0)
     feature_ranges = {
-        'GDP per capita': (df['GDP per capita'].min(), df['GDP per capita'].max()),
-        'headcount_ratio_upper_mid_income_povline': (df['headcount_ratio_upper_mid_income_povline'].min(), 
-                                                   df['headcount_ratio_upper_mid_income_povline'].max()),
-        'year': (int(df['year'].min()), int(df['year'].max()))
+        'GDP per capita': (lows[0], highs[0]),
+        'headcount_ratio_upper_mid_income_povline': (lows[1], highs[1]),
+        'year': (int(lows[2]), int(highs[2]))
     }
     
     # Save model and ranges
     joblib.dump(model, model_path)
     joblib.dump(feature_ranges, ranges_path)
     
+    model.flat_forest_ = flatten_forest(model)
+    _MODEL_CACHE.update(model=model, ranges=feature_ranges)
+    
     return model, feature_ranges
 
 def predict_life_expectancy(model: RandomForestRegressor, 
@@ -65,11 +121,26 @@ def predict_life_expectancy(model: RandomForestRegressor,
     Returns:
         float: Predicted life expectancy
     """
-    # Create input array
-    X_pred = np.array([[gdp, poverty_rate, year]])
+    forest = getattr(model, 'flat_forest_', None)
+    if forest is None:
+        forest = flatten_forest(model)
+    
+    # Create input vector (sklearn compares float32 features against the thresholds)
+    x = np.array([gdp, poverty_rate, year], dtype=np.float32)
+    
+    # Walk all trees in lockstep until every tree has reached a leaf
+    trees = np.arange(forest['left'].shape[0])
+    node = np.zeros(trees.shape[0], dtype=np.int32)
+    while True:
+        left = forest['left'][trees, node]
+        internal = left != -1
+        if not internal.any():
+            break
+        go_left = x[forest['feature'][trees, node]] <= forest['threshold'][trees, node]
+        node = np.where(internal, np.where(go_left, left, forest['right'][trees, node]), node)
     
-    # Make prediction
-    prediction = model.predict(X_pred)[0]
+    # Average the leaf values across trees
+    prediction = float(forest['value'][trees, node].mean(dtype=np.float64))
     
     return prediction
 
@@ -1,10 +1,131 @@
 import plotly.express as px
+import plotly.graph_objects as go
+import numpy as np
 import pandas as pd
+import streamlit as st
+from plotly.colors import sample_colorscale
 from plotly.graph_objects import Figure
+from data import year_index, country_index, select_countries
 
+def marker_sizes(population: pd.Series, size_max: float = 20.0) -> np.ndarray:
+    """
+    Scale population to marker diameters, with the largest country at size_max pixels.
+    
+    Args:
+        population (pd.Series): Population per point
+        size_max (float): Diameter of the largest marker in pixels
+        
+    Returns:
+        np.ndarray: Marker sizes in pixels
+    """
+    root = np.sqrt(np.nan_to_num(population.to_numpy(dtype=np.float32)))
+    peak = root.max() if root.size else 0.0
+    return root * (size_max / peak) if peak > 0 else root
+
+@st.cache_resource(hash_funcs={pd.DataFrame: id})
+def year_marker_sizes(df: pd.DataFrame) -> dict[int, np.ndarray]:
+    """
+    Precompute population marker sizes for every year, aligned with year_index.
+    
+    Args:
+        df (pd.DataFrame): The input dataframe
+        
+    Returns:
+        dict[int, np.ndarray]: Mapping from year to marker sizes in pixels
+    """
+    return {year: marker_sizes(year_data['Population']) for year, year_data in year_index(df).items()}
+
+# Poverty rate colour bins: 32 Viridis steps over 0-100%, plus grey for missing values
+POVERTY_BINS = np.linspace(0, 100, 33)
+POVERTY_PALETTE = np.array(sample_colorscale('Viridis', np.linspace(0, 1, 32)) + ['lightgrey'], dtype=object)
+
+def poverty_colors(poverty: pd.Series) -> np.ndarray:
+    """
+    Map poverty rates to binned Viridis colour strings.
+    
+    Args:
+        poverty (pd.Series): Poverty rate per point, in percent
+        
+    Returns:
+        np.ndarray: One colour string per point
+    """
+    values = poverty.to_numpy(dtype=np.float32)
+    codes = np.clip(np.digitize(values, POVERTY_BINS) - 1, 0, 31)
+    codes[np.isnan(values)] = 32
+    return POVERTY_PALETTE[codes]
+
+@st.cache_resource(hash_funcs={pd.DataFrame: id})
+def year_poverty_colors(df: pd.DataFrame) -> dict[int, np.ndarray]:
+    """
+    Precompute poverty rate marker colours for every year, aligned with year_index.
+    
+    Args:
+        df (pd.DataFrame): The input dataframe
+        
+    Returns:
+        dict[int, np.ndarray]: Mapping from year to colour strings
+    """
+    return {
+        year: poverty_colors(year_data['headcount_ratio_upper_mid_income_povline'])
+        for year, year_data in year_index(df).items()
+    }
+
+# Above this many selected rows the trend plot drops unified hover
+UNIFIED_HOVER_MAX_POINTS = 20_000
+
+# Longest series sent to the browser per trace; longer ones are downsampled
+MAX_TRACE_POINTS = 2000
+
+def downsample_lttb(x: np.ndarray, y: np.ndarray, n_out: int = MAX_TRACE_POINTS) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Downsample a line series with Largest-Triangle-Three-Buckets.
+    Series of at most n_out points are returned unchanged; missing values are dropped otherwise.
+    Kept points are returned in the input dtypes, so float32 series stay float32.
+    
+    Args:
+        x (np.ndarray): Sorted x values
+        y (np.ndarray): y values
+        n_out (int): Number of points to keep
+        
+    Returns:
+        tuple: (x, y) of the kept points
+    """
+    if len(x) <= n_out or n_out < 3:
+        return x, y
+    
+    finite = np.isfinite(y)
+    x, y = np.asarray(x)[finite], np.asarray(y)[finite]
+    n = len(x)
+    if n <= n_out:
+        return x, y
+    
+    # Triangle areas are computed in float64; only the selection uses the inputs
+    xf, yf = x.astype(np.float64), y.astype(np.float64)
+    
+    # First and last points are kept, the rest is split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = xf[end:next_end].mean(), yf[end:next_end].mean()
+        
+        # Keep the point forming the largest triangle with the last kept point and the next bucket's mean
+        area = np.abs((xf[a] - avg_x) * (yf[start:end] - yf[a]) - (xf[a] - xf[start:end]) * (avg_y - yf[a]))
+        a = start + int(area.argmax())
+        keep[i + 1] = a
+    
+    return x[keep], y[keep]
+
+@st.cache_resource(show_spinner=False, max_entries=64, hash_funcs={pd.DataFrame: id})
 def create_gdp_life_expectancy_scatter(df: pd.DataFrame, selected_year: int) -> Figure:
     """
     Create a scatter plot of GDP per capita vs Life Expectancy for a selected year.
+    Figures are cached per year and the same object is returned on every
+    rerun, without a copy; it is shared between sessions and must be
+    treated as read-only (st.plotly_chart only serialises it).
     
     Args:
         df (pd.DataFrame): The input dataframe
@@ -13,33 +134,58 @@ def create_gdp_life_expectancy_scatter(df: pd.DataFrame, selected_year: int) ->
     Returns:
         Figure: A plotly figure object
     """
-    # Filter data for selected year
-    year_data = df[df['year'] == selected_year]
+    # Look up data for selected year
+    year_data = year_index(df)[selected_year]
     
-    # Create scatter plot
-    fig = px.scatter(
-        year_data,
-        x='GDP per capita',
-        y='Life Expectancy (IHME)',
-        hover_data=['country', 'Population'],
-        size='Population',
-        color='headcount_ratio_upper_mid_income_povline',
-        color_continuous_scale='Viridis',
-        log_x=True,  # Log scale for GDP
-        title=f'Relationship between GDP per Capita and Life Expectancy ({selected_year})',
-        labels={
-            'GDP per capita': 'GDP per Capita (USD, log scale)',
-            'Life Expectancy (IHME)': 'Life Expectancy (years)',
-            'headcount_ratio_upper_mid_income_povline': 'Poverty Rate (%)'
+    # Points carry precomputed colours; the colour bar comes from an empty second trace
+    traces = [
+        {
+            'type': 'scattergl',
+            'x': year_data['GDP per capita'].to_numpy(dtype=np.float32),
+            'y': year_data['Life Expectancy (IHME)'].to_numpy(dtype=np.float32),
+            'mode': 'markers',
+            'marker': {
+                'size': year_marker_sizes(df)[selected_year],
+                'color': year_poverty_colors(df)[selected_year]
+            },
+            'customdata': year_data[['country', 'Population', 'headcount_ratio_upper_mid_income_povline']].to_numpy(),
+            'hovertemplate': (
+                '<b>%{customdata[0]}</b><br>'
+                'GDP per Capita: %{x:,.0f}<br>'
+                'Life Expectancy: %{y:.1f}<br>'
+                'Population: %{customdata[1]:,.0f}<br>'
+                'Poverty Rate: %{customdata[2]:.1f}%<extra></extra>'
+            ),
+            'name': ''
+        },
+        {
+            'type': 'scattergl',
+            'x': [None],
+            'y': [None],
+            'mode': 'markers',
+            'marker': {
+                'color': [0],
+                'cmin': POVERTY_BINS[0],
+                'cmax': POVERTY_BINS[-1],
+                'colorscale': 'Viridis',
+                'showscale': True,
+                'colorbar': {'title': 'Poverty Rate (%)'}
+            },
+            'hoverinfo': 'skip',
+            'showlegend': False
         }
-    )
+    ]
     
-    # Update layout
-    fig.update_layout(
-        xaxis_title='GDP per Capita (USD, log scale)',
-        yaxis_title='Life Expectancy (years)',
-        hovermode='closest',
-        showlegend=True
+    # Build the figure in one go, so data and layout are validated once
+    fig = go.Figure(
+        data=traces,
+        layout=dict(
+            title=f'Relationship between GDP per Capita and Life Expectancy ({selected_year})',
+            xaxis=dict(type='log', title='GDP per Capita (USD, log scale)'),  # Log scale for GDP
+            yaxis=dict(title='Life Expectancy (years)'),
+            hovermode='closest',
+            showlegend=False
+        )
     )
     
     return fig
@@ -47,6 +193,7 @@ def create_gdp_life_expectancy_scatter(df: pd.DataFrame, selected_year: int) ->
 def create_country_trend_plot(df: pd.DataFrame, selected_countries: list[str]) -> Figure:
     """
     Create a line chart showing life expectancy and GDP trends for selected countries.
+    Figures are cached per set of countries; traces are ordered by country name.
     
     Args:
         df (pd.DataFrame): The input dataframe
@@ -55,54 +202,75 @@ def create_country_trend_plot(df: pd.DataFrame, selected_countries: list[str]) -
     Returns:
         Figure: Plotly figure object
     """
-    # Filter data for selected countries
-    country_data = df[df['country'].isin(selected_countries)]
+    # Cache by the set of countries, independent of selection order
+    return _country_trend_plot(df, tuple(sorted(selected_countries)))
+
+@st.cache_data(show_spinner=False, max_entries=64, hash_funcs={pd.DataFrame: id})
+def _country_trend_plot(df: pd.DataFrame, selected_countries: tuple[str, ...]) -> Figure:
+    # Filter data for selected countries; rows come back as one contiguous,
+    # year-ordered block per country, in the order the countries are given
+    index = country_index(df)
+    countries = [country for country in selected_countries if country in index]
+    country_data = select_countries(df, countries)
+    bounds = np.cumsum([0] + [len(index[country]) for country in countries])
     
-    # Create figure with secondary y-axis
-    fig = px.line(
-        country_data,
-        x='year',
-        y='Life Expectancy (IHME)',
-        color='country',
-        title='Life Expectancy and GDP Trends by Country',
-        labels={
-            'year': 'Year',
-            'Life Expectancy (IHME)': 'Life Expectancy (years)',
-            'country': 'Country'
-        }
+    # One array per metric, each row contiguous so country slices are cheap views
+    years = country_data['year'].to_numpy()
+    life_expectancy, gdp = np.ascontiguousarray(
+        country_data[['Life Expectancy (IHME)', 'GDP per capita']].to_numpy(dtype=np.float32).T
     )
     
-    # Add GDP line
-    fig.add_trace(
-        px.line(
-            country_data,
-            x='year',
-            y='GDP per capita',
-            color='country',
-            line_dash='country'
-        ).data[0]
-    )
+    # Collect one life expectancy and one GDP trace per country as plain dicts
+    traces = []
+    palette = px.colors.qualitative.Plotly
+    for i, country in enumerate(countries):
+        rows = slice(bounds[i], bounds[i + 1])
+        color = palette[i % len(palette)]
+        le_x, le_y = downsample_lttb(years[rows], life_expectancy[rows])
+        gdp_x, gdp_y = downsample_lttb(years[rows], gdp[rows])
+        traces.append({
+            'type': 'scattergl',
+            'x': le_x,
+            'y': le_y,
+            'mode': 'lines',
+            'name': f"{country} - Life Expectancy",
+            'legendgroup': country,
+            'line': {'color': color}
+        })
+        traces.append({
+            'type': 'scattergl',
+            'x': gdp_x,
+            'y': gdp_y,
+            'mode': 'lines',
+            'name': f"{country} - GDP",
+            'legendgroup': country,
+            'line': {'color': color, 'dash': 'dash'},
+            'yaxis': 'y2'
+        })
     
-    # Update layout
-    fig.update_layout(
-        xaxis_title='Year',
-        yaxis_title='Life Expectancy (years)',
-        yaxis2=dict(
-            title='GDP per Capita (USD)',
-            overlaying='y',
-            side='right'
-        ),
-        hovermode='x unified',
-        showlegend=True
-    )
+    # Unified hover scans every trace per mouse move; bound it on dense selections
+    if len(country_data) < UNIFIED_HOVER_MAX_POINTS:
+        hover = dict(hovermode='x unified')
+    else:
+        hover = dict(hovermode='x', hoverdistance=1)
     
-    # Update traces
-    for i, trace in enumerate(fig.data):
-        if i < len(selected_countries):  # Life expectancy traces
-            trace.name = f"{trace.name} - Life Expectancy"
-        else:  # GDP traces
-            trace.name = f"{trace.name} - GDP"
-            trace.yaxis = 'y2'
+    # Build the figure in one go, so data and layout are validated once
+    fig = go.Figure(
+        data=traces,
+        layout=dict(
+            title='Life Expectancy and GDP Trends by Country',
+            xaxis=dict(title='Year'),
+            yaxis=dict(title='Life Expectancy (years)'),
+            yaxis2=dict(
+                title='GDP per Capita (USD)',
+                overlaying='y',
+                side='right'
+            ),
+            showlegend=True,
+            legend=dict(itemsizing='constant'),
+            **hover
+        )
+    )
     
     return fig
 
@@ -117,8 +285,8 @@ def create_world_map(df: pd.DataFrame, selected_year: int) -> Figure:
     Returns:
         Figure: Plotly figure object
     """
-    # Filter data for selected year
-    year_data = df[df['year'] == selected_year]
+    # Look up data for selected year
+    year_data = year_index(df)[selected_year]
     
     # Create choropleth map
     fig = px.choropleth(
@@ -159,28 +327,35 @@ def create_gdp_poverty_scatter(df: pd.DataFrame, selected_year: int) -> Figure:
     Returns:
         Figure: Plotly figure object
     """
-    # Filter data for selected year
-    year_data = df[df['year'] == selected_year]
+    # Look up data for selected year
+    year_data = year_index(df)[selected_year]
     
     # Create scatter plot
-    fig = px.scatter(
-        year_data,
-        x='GDP per capita',
-        y='headcount_ratio_upper_mid_income_povline',
-        hover_data=['country', 'Life Expectancy (IHME)'],
-        size='Population',
-        color='Life Expectancy (IHME)',
-        color_continuous_scale='Viridis',
-        log_x=True,
-        title=f'Relationship between GDP and Poverty Rate ({selected_year})',
-        labels={
-            'GDP per capita': 'GDP per Capita (USD, log scale)',
-            'headcount_ratio_upper_mid_income_povline': 'Poverty Rate (%)',
-            'Life Expectancy (IHME)': 'Life Expectancy (years)'
-        }
-    )
+    fig = go.Figure(go.Scattergl(
+        x=year_data['GDP per capita'].to_numpy(dtype=np.float32),
+        y=year_data['headcount_ratio_upper_mid_income_povline'].to_numpy(dtype=np.float32),
+        mode='markers',
+        marker=dict(
+            size=year_marker_sizes(df)[selected_year],
+            color=year_data['Life Expectancy (IHME)'].to_numpy(dtype=np.float32),
+            colorscale='Viridis',
+            showscale=True,
+            colorbar=dict(title='Life Expectancy (years)')
+        ),
+        customdata=year_data[['country', 'Population']].to_numpy(),
+        hovertemplate=(
+            '<b>%{customdata[0]}</b><br>'
+            'GDP per Capita: %{x:,.0f}<br>'
+            'Poverty Rate: %{y:.1f}%<br>'
+            'Population: %{customdata[1]:,.0f}<br>'
+            'Life Expectancy: %{marker.color:.1f}<extra></extra>'
+        ),
+        name=''
+    ))
     
     fig.update_layout(
+        title=f'Relationship between GDP and Poverty Rate ({selected_year})',
+        xaxis_type='log',
         xaxis_title='GDP per Capita (USD, log scale)',
         yaxis_title='Poverty Rate (%)',
         hovermode='closest'
@@ -199,8 +374,8 @@ def create_life_expectancy_boxplot(df: pd.DataFrame, selected_year: int) -> Figu
     Returns:
         Figure: Plotly figure object
     """
-    # Filter data for selected year
-    year_data = df[df['year'] == selected_year]
+    # Look up data for selected year
+    year_data = year_index(df)[selected_year]
     
     # Create box plot
     fig = px.box(